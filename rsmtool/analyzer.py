@@ -769,7 +769,7 @@ class Analyzer:
 
         # if we only have a single value for human correlation and the index
         # is not in human-machine values, we use the same HH value in all cases
-        if len(human_human_corr) == 1 and not human_human_corr.index[0] in human_machine_corr.index:
+        if len(human_human_corr) == 1 and human_human_corr.index[0] not in human_machine_corr.index:
             human_human_corr = pd.Series(human_human_corr.values.repeat(len(human_machine_corr)),
                                          index=human_machine_corr.index)
 
@@ -29,6 +29,7 @@ from rsmtool import HAS_RSMEXTRA
 from rsmtool.utils import parse_json_with_comments
 from rsmtool.utils import (DEFAULTS,
                            CHECK_FIELDS,
+                           CONTEXT_FIELDS,
                            LIST_FIELDS,
                            BOOLEAN_FIELDS,
                            MODEL_NAME_MAPPING,
@@ -39,6 +40,12 @@ from rsmtool.utils import (DEFAULTS,
 from skll import Learner
 from skll.metrics import SCORERS
 
+# the strings that are accepted for boolean fields
+BOOLEAN_VALUES = {'true': True, 'false': False}
+
+# regular expression to find whitespace in ID fields
+WHITESPACE_RE = re.compile(r'\s')
+
 if HAS_RSMEXTRA:
     from rsmextra.settings import (default_feature_subset_file,
                                    default_feature_sign)
@@ -323,8 +330,7 @@ class Configuration:
                        '{}_{}.json'.format(self._config[id_field],
                                            self._context))
 
-        expected_fields = (CHECK_FIELDS[self._context]['required'] +
-                           CHECK_FIELDS[self._context]['optional'])
+        expected_fields = CONTEXT_FIELDS[self._context]
 
         output_config = {k: v for k, v in self._config.items() if k in expected_fields}
         with open(outjson, 'w') as outfile:
@@ -410,11 +416,11 @@ class Configuration:
                                  "Please refer to the documentation for "
                                  "further information.")
 
-            for column in original_filter_dict:
+            for column, values in original_filter_dict.items():
 
                 # if we were given a single value, convert it to list
-                if not isinstance(original_filter_dict[column], list):
-                    new_filter_dict[column] = [original_filter_dict[column]]
+                if not isinstance(values, (list, tuple)):
+                    new_filter_dict[column] = [values]
                     logging.warning("The filtering condition {}"
                                     " for column {} was converted "
                                     "to list. Only responses where "
@@ -424,17 +430,16 @@ class Configuration:
                                     "warning if this is the correct "
                                     "interpretation of your "
                                     "configuration settings"
-                                    ".".format(original_filter_dict[column],
+                                    ".".format(values,
                                                column,
                                                column,
-                                               original_filter_dict[column],
+                                               values,
                                                flag_message[partition])
                                     )
                 else:
-                    new_filter_dict[column] = original_filter_dict[column]
+                    new_filter_dict[column] = list(values)
 
-                    model_eval = ', '.join(map(str,
-                                               original_filter_dict[column]))
+                    model_eval = ', '.join(map(str, values))
                     logging.info("Only responses where "
                                  "{} equals one of the following values "
                                  "will be used for {} the model: "
@@ -483,11 +488,11 @@ class Configuration:
         spec_trim_max = config.get('trim_max', None)
         spec_trim_tolerance = config.get('trim_tolerance', None)
 
-        if spec_trim_min:
+        if spec_trim_min is not None:
             spec_trim_min = float(spec_trim_min)
-        if spec_trim_max:
+        if spec_trim_max is not None:
             spec_trim_max = float(spec_trim_max)
-        if spec_trim_tolerance:
+        if spec_trim_tolerance is not None:
             spec_trim_tolerance = float(spec_trim_tolerance)
         return (spec_trim_min, spec_trim_max, spec_trim_tolerance)
 
@@ -510,7 +515,7 @@ class Configuration:
         if subgroups:
             string_columns.extend(subgroups)
 
-        return dict([(column, str) for column in string_columns if column])
+        return {column: str for column in string_columns if column}
 
     def get_names_and_paths(self, keys, names):
         """
@@ -658,7 +663,7 @@ class ConfigurationParser:
                 raise ValueError("{} is too long (must be "
                                  "<=200 characters)".format(id_field))
 
-            if re.search(r'\s', id_field_value):
+            if WHITESPACE_RE.search(id_field_value):
                 raise ValueError("{} cannot contain any "
                                  "spaces".format(id_field))
 
@@ -843,24 +848,27 @@ class ConfigurationParser:
         # 1. Check to make sure all required fields are specified
         required_fields = CHECK_FIELDS[context]['required']
 
-        for field in required_fields:
-            if field not in new_config:
-                raise ValueError("The config file must "
-                                 "specify '{}'".format(field))
-
-        # 2. Add default values for unspecified optional fields
-        # for given RSMTool context
-        defaults = DEFAULTS
-
-        for field in defaults:
+        missing_fields = set(required_fields).difference(new_config)
+        if missing_fields:
+            missing_fields = [field for field in required_fields
+                              if field in missing_fields]
+            raise ValueError("The config file must "
+                             "specify '{}'".format("', '".join(missing_fields)))
+
+        # 2. Check to make sure no unrecognized fields are specified
+        unrecognized_fields = set(new_config).difference(DEFAULTS, required_fields)
+        if unrecognized_fields:
+            unrecognized_fields = [field for field in new_config
+                                   if field in unrecognized_fields]
+            raise ValueError("Unrecognized field '{}'"
+                             " in json file".format("', '".join(unrecognized_fields)))
+
+        # 3. Add default values for unspecified optional fields
+        # for given RSMTool context; we iterate over the defaults
+        # rather than a set difference to keep the field order stable
+        for field in DEFAULTS:
             if field not in new_config:
-                new_config[field] = defaults[field]
-
-        # 3. Check to make sure no unrecognized fields are specified
-        for field in new_config:
-            if field not in defaults and field not in required_fields:
-                raise ValueError("Unrecognized field '{}'"
-                                 " in json file".format(field))
+                new_config[field] = DEFAULTS[field]
 
         # 4. Check to make sure that the ID fields that will be
         # used as part of filenames formatted correctly
@@ -1001,8 +1009,7 @@ class ConfigurationParser:
                                                  for group in new_config['subgroups']}
 
         # 14. Clean up config dict to keep only context-specific fields
-        context_relevant_fields = (CHECK_FIELDS[context]['optional'] +
-                                   CHECK_FIELDS[context]['required'])
+        context_relevant_fields = CONTEXT_FIELDS[context]
 
         new_config = {k: v for k, v in new_config.items()
                       if k in context_relevant_fields}
@@ -1059,13 +1066,10 @@ class ConfigurationParser:
                 if not isinstance(new_config[field], bool):
                     # we first convert the value to string to avoid
                     # attribute errors in case the user supplied an integer.
-                    given_value = str(new_config[field]).strip()
-                    m = re.match(r'^(true|false)$', given_value, re.I)
-                    if not m:
+                    given_value = str(new_config[field]).strip().lower()
+                    if given_value not in BOOLEAN_VALUES:
                         raise ValueError(error_message)
-                    else:
-                        bool_value = json.loads(m.group().lower())
-                        new_config[field] = bool_value
+                    new_config[field] = BOOLEAN_VALUES[given_value]
 
         if inplace:
             self._config = new_config
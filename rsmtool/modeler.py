@@ -355,8 +355,9 @@ class Modeler:
         original_features = [c for c in df_train_eqwt.columns if c not in ['sc1',
                                                                            'sumfeature',
                                                                            'spkitemid']]
-        coefs = pd.Series(dict([(origf, coef)
-                                for origf in original_features] + [('const', const)]))
+        coef_dict = {origf: coef for origf in original_features}
+        coef_dict['const'] = const
+        coefs = pd.Series(coef_dict)
         df_coef = self.ols_coefficients_to_dataframe(coefs)
 
         # create fake SKLL learner with these coefficients
@@ -9,16 +9,17 @@ Classes for preprocessing input data in various contexts.
 """
 
 import logging
-import re
 import warnings
 
+from collections import namedtuple
+
 import numpy as np
 import pandas as pd
 
-from collections import defaultdict
 from os.path import dirname, abspath
 
 from numpy.random import RandomState
+from pandas.api.types import infer_dtype
 
 from rsmtool.configuration_parser import Configuration
 from rsmtool.reader import DataReader
@@ -28,6 +29,30 @@ from rsmtool.transformer import FeatureTransformer
 from rsmtool.utils import convert_to_float
 from rsmtool.utils import is_built_in_model, is_skll_model
 
+# the values allowed in the `sign` column of the feature file
+VALID_SIGNS = np.array([-1.0, 1.0])
+
+# the old-style names of the fields in JSON feature
+# files and the new-style names they correspond to
+FEATURE_FIELD_MAPPING = {'wt': 'sign',
+                         'featN': 'feature',
+                         'trans': 'transform'}
+
+# the fields that must be specified for each feature
+REQUIRED_FEATURE_FIELDS = frozenset(['feature', 'sign', 'transform'])
+
+# the data frames and values returned by `FeaturePreprocessor.filter_data()`
+FilteredData = namedtuple('FilteredData', ['features',
+                                           'metadata',
+                                           'other_columns',
+                                           'excluded',
+                                           'length',
+                                           'human_scores',
+                                           'flagged_responses',
+                                           'trim_min',
+                                           'trim_max',
+                                           'feature_names'])
+
 
 class FeatureSubsetProcessor:
     """
@@ -104,31 +129,32 @@ class FeatureSubsetProcessor:
         # we want to allow title-cased names of columns for historical reasons
         # e.g., `Feature` instead of `feature` etc.
 
-        df_feature_specs = df.copy()
+        columns = set(df.columns)
 
-        if ('feature' not in df_feature_specs and
-                'Feature' not in df_feature_specs):
+        if not columns.intersection(['feature', 'Feature']):
             raise ValueError("The feature_subset_file must contain "
                              "a column named 'feature' "
                              "containing the feature names.")
         if subset:
-            if subset not in df_feature_specs:
+            if subset not in columns:
                 raise ValueError("Unknown value for feature_subset: {}".format(subset))
 
-            if not df_feature_specs[subset].isin([0, 1]).all():
+            if not df[subset].isin([0, 1]).all():
                 raise ValueError("The subset columns in feature "
                                  "file can only contain 0 or 1")
 
         if sign:
-            if ('sign_{}'.format(sign) not in df_feature_specs and
-                    'Sign_{}'.format(sign) not in df_feature_specs):
+            sign_columns = columns.intersection(['sign_{}'.format(sign),
+                                                 'Sign_{}'.format(sign)])
+            if not sign_columns:
                 raise ValueError("The feature_subset_file must "
                                  "contain the requested "
                                  "sign column 'sign_{}'".format(sign))
 
-            if not df_feature_specs[subset].isin(['-', '+']).all():
-                raise ValueError("The sign columns in feature "
-                                 "file can only contain - or +")
+            for sign_column in sign_columns:
+                if not df[sign_column].isin(['-', '+']).all():
+                    raise ValueError("The sign columns in feature "
+                                     "file can only contain - or +")
 
 
 class FeatureSpecsProcessor:
@@ -167,26 +193,21 @@ class FeatureSpecsProcessor:
                       """specify JSON feature files for the RSMTool experiments.""",
                       category=DeprecationWarning)
 
-        field_mapping = {'wt': 'sign',
-                         'featN': 'feature',
-                         'trans': 'transform'}
-
-        required_fields = ['feature', 'sign', 'transform']
-
-        new_feature_json = defaultdict(list)
+        new_feature_json = {'features': []}
 
         feature_list = (feature_json['features'] if 'features' in feature_json
                         else feature_json['feats'])
 
         for feature_dict in feature_list:
-            new_feature_dict = {}
-            for field in feature_dict:
-                norm_field = (field_mapping[field] if field in field_mapping
-                              else field)
-                new_feature_dict[norm_field] = feature_dict[field]
-
-            new_feature_keys = new_feature_dict.keys()
-            missing_fields = set(required_fields).difference(new_feature_keys)
+
+            # only build a new dictionary if any fields need renaming
+            if FEATURE_FIELD_MAPPING.keys() & feature_dict.keys():
+                new_feature_dict = {FEATURE_FIELD_MAPPING.get(field, field): value
+                                    for field, value in feature_dict.items()}
+            else:
+                new_feature_dict = feature_dict
+
+            missing_fields = REQUIRED_FEATURE_FIELDS.difference(new_feature_dict)
             if missing_fields:
                 raise KeyError("The feature file does not "
                                "contain the following fields: "
@@ -303,21 +324,31 @@ class FeatureSpecsProcessor:
                            "column named 'feature'")
 
         # check to make sure that there are no duplicate feature names
-        feature_name_count = df_specs_new['feature'].value_counts()
-        duplicate_features = feature_name_count[feature_name_count > 1]
-        if len(duplicate_features) > 0:
+        feature_names = pd.Index(df_specs_new['feature'].values)
+        if not feature_names.is_unique:
+            duplicate_features = feature_names[feature_names.duplicated()].unique()
             raise ValueError("The following feature names "
                              " are duplicated in the feature "
-                             "file: {}".format(duplicate_features.index))
+                             "file: {}".format(duplicate_features))
 
         # if we have `sign` column, check that it can be converted to float
         if 'sign' in df_specs_new:
-            try:
-                df_specs_new['sign'] = df_specs_new['sign'].astype(float)
-                assert np.all(df_specs_new['sign'].isin([-1, 1]))
-            except (ValueError, AssertionError):
-                raise ValueError("The `sign` column in the feature"
-                                 "file can only contain '1' or '-1'")
+            error_message = ("The `sign` column in the feature"
+                             "file can only contain '1' or '-1'")
+
+            # we only need to convert the signs if they are not
+            # already floats, e.g., if they were read as strings
+            signs = df_specs_new['sign']
+            if signs.dtype.kind != 'f':
+                try:
+                    signs = signs.astype(float)
+                except ValueError:
+                    raise ValueError(error_message)
+
+            if not np.isin(signs.values, VALID_SIGNS).all():
+                raise ValueError(error_message)
+
+            df_specs_new['sign'] = signs
         else:
             df_specs_new['sign'] = 1
 
@@ -435,6 +466,30 @@ class FeaturePreprocessor:
 
         return model_type
 
+    @staticmethod
+    def coerce_to_float_array(values):
+        """
+        Convert the given values to a numpy array of floats.
+        Any values that cannot be converted are set to NaN.
+
+        Parameters
+        ----------
+        values : pandas Series
+            The values to convert.
+
+        Returns
+        -------
+        float_values : np.array
+            The converted values. This may share memory with
+            `values` if these are already floats.
+        """
+
+        # values that are already numeric can be cast directly
+        # without going through `pd.to_numeric()`
+        if values.dtype.kind not in 'biuf':
+            values = pd.to_numeric(values, errors='coerce')
+        return values.values.astype(float, copy=False)
+
     @staticmethod
     def trim(values,
              trim_min,
@@ -590,17 +645,19 @@ class FeaturePreprocessor:
             less than N items
         """
 
-        items_per_candidate = df[candidate_col].value_counts()
-
-        selected_candidates = items_per_candidate[items_per_candidate >= N]
-        selected_candidates = selected_candidates.index
-
-        df_included = df[df[candidate_col].isin(selected_candidates)].copy()
-        df_excluded = df[~df[candidate_col].isin(selected_candidates)].copy()
+        # encode the candidate IDs as integer codes so that we can count
+        # the items per candidate without hashing the IDs again and then
+        # use the counts to compute a single mask for both subsets;
+        # rows with missing candidate IDs get a code of -1 and are excluded
+        codes, _ = pd.factorize(df[candidate_col])
+        has_candidate = codes >= 0
+        items_per_candidate = np.bincount(codes[has_candidate])
+        selected = np.zeros(len(df), dtype=bool)
+        selected[has_candidate] = items_per_candidate[codes[has_candidate]] >= N
 
-        # reset indices
-        df_included.reset_index(drop=True, inplace=True)
-        df_excluded.reset_index(drop=True, inplace=True)
+        # `iloc` already returns new data frames so we do not need to copy
+        df_included = df.iloc[selected].reset_index(drop=True)
+        df_excluded = df.iloc[~selected].reset_index(drop=True)
 
         return (df_included,
                 df_excluded)
@@ -644,10 +701,14 @@ class FeaturePreprocessor:
                            "for the following "
                            "subgroups: {}".format(', '.join(missing_sub_cols)))
 
-        # replace any empty values in subgroups values by "No info"
-        empty_value = re.compile(r"^\s*$")
-        df[subgroups] = df[subgroups].replace(to_replace=empty_value,
-                                              value='No info')
+        # replace any empty values in subgroups values by "No info";
+        # only string values can be empty so we skip all other columns
+        for subgroup in subgroups:
+            values = df[subgroup]
+            if values.dtype == object:
+                is_empty = (values.str.strip() == '').values
+                if is_empty.any():
+                    df[subgroup] = values.where(~is_empty, 'No info')
         return df
 
     @staticmethod
@@ -695,8 +756,6 @@ class FeaturePreprocessor:
             re-namings.
         """
 
-        df = df.copy()
-
         columns = [id_column,
                    first_human_score_column,
                    second_human_score_column,
@@ -711,43 +770,32 @@ class FeaturePreprocessor:
                                                                    defaults)))
 
         # find the columns where the names match the default names
-        correct_defaults = [column for (column, default)
+        correct_defaults = {column for (column, default)
                             in name_mapping.items()
-                            if column == default]
-
-        # find the columns with default names reserved for other columns
-        # which are not used as features in the model
-        columns_with_incorrect_default_names = [column for column in df.columns
-                                                if (column in defaults and
-                                                    column not in correct_defaults and
-                                                    column not in requested_feature_names)]
-        # rename these columns
-        if columns_with_incorrect_default_names:
-            new_column_names = ['##{}##'.format(column) for column
-                                in columns_with_incorrect_default_names]
-            df.rename(columns=dict(zip(columns_with_incorrect_default_names,
-                                       new_column_names)),
-                      inplace=True)
-
-        # find the columns where the names do not match the default
-        columns_with_custom_names = [column for column in name_mapping
-                                     if column not in correct_defaults]
-
-        # rename the custom-named columns to default values
-        for column in columns_with_custom_names:
-
-            # if the column has already been renamed because it used a
-            # default name, then use the updated name
-            if column in columns_with_incorrect_default_names:
-                df.rename(columns={'##{}##'.format(column):
-                                   name_mapping[column]},
-                          inplace=True)
-            else:
-                df.rename(columns={column:
-                                   name_mapping[column]},
-                          inplace=True)
-
-        return df
+                            if column == default}
+
+        default_names = set(defaults)
+        requested_features = set(requested_feature_names)
+
+        # work out the new names for all columns at once: the custom-named
+        # columns get the default names and any other columns with default
+        # names that are not used as features in the model are renamed
+        # to ##NAME## since these names are reserved for other columns
+        new_column_names = {}
+        for column in df.columns:
+            if column in correct_defaults:
+                continue
+            if column in name_mapping:
+                new_column_names[column] = name_mapping[column]
+            elif column in default_names and column not in requested_features:
+                new_column_names[column] = '##{}##'.format(column)
+
+        # if the columns already have the right names, we only need a copy
+        if not new_column_names:
+            return df.copy()
+
+        # this also creates a copy of the input data frame
+        return df.rename(columns=new_column_names)
 
     @staticmethod
     def filter_on_column(df,
@@ -790,37 +838,38 @@ class FeaturePreprocessor:
         data frames.
         """
 
-        # create a copy of the original data frame
-        df_filter = df.copy()
-
         # return a copy of the original data frame if
         # the given column does not exist at all
         if column not in df.columns:
-            return df_filter
+            return df.copy()
 
         # Force convert the label column to numeric and
         # convert whatever can't be converted to a NaN
-        df_filter[column] = pd.to_numeric(df_filter[column],
-                                          errors='coerce').astype(float)
+        numeric_values = FeaturePreprocessor.coerce_to_float_array(df[column])
 
         # Save the values that have been converted to NaNs
         # as a separate data frame. We want to keep them as NaNs
         # to do more analyses later.
         # We also filter out inf values. Since these can only be generated
         # during transformations we convert them to NaNs for consistency.
-        bad_rows = df_filter[df_filter[column].isnull() | np.isinf(df_filter[column])]
+        is_valid = np.isfinite(numeric_values)
+        bad_rows = df[~is_valid].copy()
+        bad_rows[column] = numeric_values[~is_valid]
 
-        # drop the NaNs that we might have gotten
-        df_filter = df_filter[df_filter[column].notnull() & ~np.isinf(df_filter[column])]
-
-        # exclude zeros if specified
+        # exclude zeros if specified; unlike the other excluded
+        # responses, these keep their original values
         if exclude_zeros:
-            zero_indices = df_filter[df_filter[column] == 0].index.values
-            zero_rows = df.loc[zero_indices]
-            df_filter = df_filter[df_filter[column] != 0]
+            is_zero = numeric_values == 0
+            zero_rows = df[is_zero]
+            is_valid &= ~is_zero
         else:
             zero_rows = pd.DataFrame()
 
+        # drop the NaNs that we might have gotten
+        # and convert the remaining values
+        df_filter = df[is_valid].copy()
+        df_filter[column] = numeric_values[is_valid]
+
         # combine all the filtered rows into a single data frame
         df_exclude = pd.concat([bad_rows, zero_rows], sort=True)
 
@@ -846,6 +895,117 @@ class FeaturePreprocessor:
         # return the filtered rows and the new data frame
         return (df_filter, df_exclude)
 
+    @staticmethod
+    def filter_on_columns(df,
+                          columns,
+                          id_column,
+                          exclude_zero_sd=False,
+                          df_excluded=None):
+        """
+        Filter out the rows in the given data frame that contain non-numeric
+        values in any of the specified columns. Additionally, it may exclude
+        any of these columns if they have a standard deviation
+        (:math:`\\sigma`) of 0. This gives the same results as calling
+        ``filter_on_column()`` for each of the columns in turn but
+        only needs a single pass over the data frame.
+
+        Parameters
+        ----------
+        df : pd.DataFrame
+            The DataFrame to filter on.
+        columns : list of str
+            Names of the columns from which to filter out values.
+        id_column : str
+            Name of the column containing the unique response IDs.
+        exclude_zero_sd : bool, optional
+            Whether to perform the additional filtering step of removing
+            columns that have :math:`\\sigma = 0`. Defaults to `False`.
+        df_excluded : pandas DataFrame, optional
+            Data frame containing responses that were already excluded
+            before this step. If given, the responses filtered out by
+            each of the columns are appended to it in turn.
+            Defaults to None.
+
+        Returns
+        -------
+        df_filtered : pandas DataFrame
+            Data frame containing the responses that were *not* filtered out.
+        df_excluded : pandas DataFrame
+            Data frame containing the responses that were filtered out.
+            The responses filtered out because of each column form a
+            separate block with its own index, in the order of the columns.
+
+        Note
+        ----
+        The columns with :math:`\\sigma=0` are removed from both output
+        data frames.
+        """
+
+        if not columns:
+            if df_excluded is None:
+                df_excluded = df.iloc[0:0]
+            return df.copy(), df_excluded.copy()
+
+        # Force convert all the columns to numeric and convert whatever
+        # can't be converted to a NaN. We also treat inf values as invalid
+        # since these can only be generated during transformations.
+        numeric_values = {column: FeaturePreprocessor.coerce_to_float_array(df[column])
+                          for column in columns}
+        is_valid = np.isfinite(np.column_stack([numeric_values[column]
+                                                for column in columns]))
+
+        # a response is filtered out by the first column with an invalid
+        # value, so we need to know which responses are still left
+        # before and after each of the columns has been checked
+        is_left_after = np.logical_and.accumulate(is_valid, axis=1)
+        is_left_before = np.column_stack([np.ones(len(df), dtype=bool),
+                                          is_left_after[:, :-1]])
+
+        excluded_columns = []
+        df_excluded_list = []
+        for idx, column in enumerate(columns):
+
+            # Drop this column if the standard deviation equals zero
+            # on the responses that are left after filtering on it:
+            # for training set sd == 0 will break normalization.
+            # We set the tolerance level to the 6th digit
+            # to account for a possibility that the exact value
+            # computed by std is not 0
+            if exclude_zero_sd is True:
+                feature_sd = pd.Series(numeric_values[column][is_left_after[:, idx]]).std()
+                if np.isclose(feature_sd, 0, atol=1e-07):
+                    logging.info("Feature {} was excluded from the model "
+                                 "because its standard deviation in the "
+                                 "training set is equal to 0.".format(column))
+                    excluded_columns.append(column)
+
+            # the responses filtered out by this column contain the
+            # converted values for this and all of the preceding
+            # columns and the original values for all other columns
+            is_excluded = is_left_before[:, idx] & ~is_valid[:, idx]
+            df_exclude = df.iloc[is_excluded].reset_index(drop=True)
+            for converted_column in columns[:idx + 1]:
+                df_exclude[converted_column] = numeric_values[converted_column][is_excluded]
+            df_excluded_list.append(df_exclude.drop(excluded_columns, axis=1))
+
+        df_filter = df.iloc[is_left_after[:, -1]].reset_index(drop=True)
+        for column in columns:
+            df_filter[column] = numeric_values[column][is_left_after[:, -1]]
+        df_filter = df_filter.drop(excluded_columns, axis=1)
+
+        # the blocks are appended one at a time, the same way as when
+        # calling `filter_on_column()` for each column, since the types
+        # of the resulting columns depend on the order in which the
+        # converted and unconverted values are combined
+        if df_excluded is None:
+            df_exclude, df_excluded_list = df_excluded_list[0], df_excluded_list[1:]
+        else:
+            df_exclude = df_excluded
+        for df_exclude_column in df_excluded_list:
+            df_exclude = pd.concat([df_exclude, df_exclude_column], sort=True)
+
+        return (df_filter, df_exclude)
+
     @staticmethod
     def process_predictions(df_test_predictions,
                             train_predictions_mean,
@@ -986,13 +1146,44 @@ class FeaturePreprocessor:
                                          in flag_column_dict.items()}
 
             # and now convert the the values in the feature column
-            # in the data frame
-            df_new = df[flag_columns].copy()
-            df_new = df_new.applymap(convert_to_float)
-
-            # identify responses with values which satisfy the condition
-            full_mask = df_new.isin(flag_column_dict_to_float)
-            flag_mask = full_mask[list(flag_column_dict_to_float.keys())].all(1)
+            # in the data frame and identify responses with values
+            # which satisfy the condition; since flag columns are
+            # categorical and usually only contain a handful of distinct
+            # values, we only convert and check each of the distinct values
+            # once and then use the category codes to expand the results
+            # to all rows
+            flag_mask = np.ones(len(df), dtype=bool)
+            for column, allowed_values in flag_column_dict_to_float.items():
+
+                # columns with values of mixed types may contain values
+                # such as ``True`` and ``1`` which would be assigned the
+                # same category but are converted differently, so we
+                # convert and check each of their values individually
+                values = df[column]
+                if (values.dtype == object and
+                        infer_dtype(values, skipna=True) not in ['string', 'empty']):
+                    converted_values = pd.Series([convert_to_float(value)
+                                                  for value in values.values],
+                                                 dtype=object)
+                    flag_mask &= converted_values.isin(allowed_values).values
+                    continue
+
+                codes, categories = pd.factorize(values)
+                converted_categories = pd.Series([convert_to_float(value)
+                                                  for value in categories] + [np.nan],
+                                                 dtype=object)
+                is_allowed = converted_categories.isin(allowed_values).values[codes]
+
+                # missing values do not get a category so we convert
+                # and check them individually
+                is_missing = codes == -1
+                if is_missing.any():
+                    converted_missing = pd.Series([convert_to_float(value) for value
+                                                   in values.values[is_missing]],
+                                                  dtype=object)
+                    is_allowed[is_missing] = converted_missing.isin(allowed_values).values
+
+                flag_mask &= is_allowed
 
             # return the columns from the original frame that was passed in
             # so that all data types remain the same and are not changed
@@ -1028,7 +1219,7 @@ class FeaturePreprocessor:
         ----------
         df : pd.DataFrame
             The DataFrame from which to generate feature names.
-        reserved_column_names : list
+        reserved_column_names : list or frozenset
             Names of reserved columns.
         feature_subset_specs : pd.DataFrame
             Feature subset specs
@@ -1327,8 +1518,8 @@ class FeaturePreprocessor:
             The candidate column in the data.
         requested_feature_names : list
             A list of requested feature names.
-        reserved_column_names : list
-            A list of reserved column names.
+        reserved_column_names : list or frozenset
+            A collection of reserved column names.
         given_trim_min : float
             The minimum trim value.
         given_trim_max : float
@@ -1358,26 +1549,20 @@ class FeaturePreprocessor:
 
         Returns
         -------
-        df_filtered_features : pd.DataFrame
-            DataFrame with filtered features
-        df_filtered_metadata : pd.DataFrame
-            DataFrame with filtered metadata
-        df_filtered_other_columns : pd.DataFrame
-            DataFrame with other columns filtered
-        df_excluded : pd.DataFrame
-            DataFrame with excluded records
-        df_filtered_length : pd.DataFrame
-            DataFrame with length column(s) filtered
-        df_filtered_human_scores : pd.DataFrame
-            DataFrame with human scores filtered
-        df_responses_with_excluded_flags : pd.DataFrame
-            A DataFrame containing responses with excluded flags
-        trim_min : float
-            The maximum trim value
-        trim_max : float
-            The minimum trim value
-        feature_names  : list
-            A list of feature names
+        filtered_data : FilteredData
+            A named tuple with the following fields, in this order:
+
+            - features : DataFrame with filtered features
+            - metadata : DataFrame with filtered metadata
+            - other_columns : DataFrame with other columns filtered
+            - excluded : DataFrame with excluded records
+            - length : DataFrame with length column(s) filtered
+            - human_scores : DataFrame with human scores filtered
+            - flagged_responses : DataFrame containing responses
+              with excluded flags
+            - trim_min : The minimum trim value
+            - trim_max : The maximum trim value
+            - feature_names : A list of feature names
         """
 
         # make sure that the columns specified in the
@@ -1424,10 +1609,12 @@ class FeaturePreprocessor:
                                          candidate_column)
 
         # check that the id_column contains unique values
-        if df['spkitemid'].size != df['spkitemid'].unique().size:
+        duplicated_ids = df['spkitemid'].duplicated()
+        if duplicated_ids.any():
+            example_ids = df.loc[duplicated_ids, 'spkitemid'].head(5).tolist()
             raise ValueError("The data contains duplicate response IDs in "
-                             "'{}'. Please make sure all response IDs are "
-                             "unique and re-run the tool.".format(id_column))
+                             "'{}' (e.g. {}). Please make sure all response IDs are "
+                             "unique and re-run the tool.".format(id_column, example_ids))
 
         # Generate feature names if no specific features were requested by the user
         if len(requested_feature_names) == 0:
@@ -1470,18 +1657,18 @@ class FeaturePreprocessor:
                                  "non-numeric human scores. No further analysis "
                                  "can be run. ")
 
-            trim_min = given_trim_min if given_trim_min else df_filtered['sc1'].min()
-            trim_max = given_trim_max if given_trim_max else df_filtered['sc1'].max()
+            trim_min = given_trim_min if given_trim_min is not None else df_filtered['sc1'].min()
+            trim_max = given_trim_max if given_trim_max is not None else df_filtered['sc1'].max()
         else:
             df_filtered = df_responses_with_requested_flags.copy()
-            trim_min = given_trim_min if given_trim_min else 1
-            trim_max = given_trim_max if given_trim_max else 10
+            trim_min = given_trim_min if given_trim_min is not None else 1
+            trim_max = given_trim_max if given_trim_max is not None else 10
             logging.info("Generating labels randomly "
                          "from [{}, {}]".format(trim_min, trim_max))
             randgen = RandomState(seed=1234567890)
-            df_filtered[label_column] = randgen.random_integers(trim_min,
-                                                                trim_max,
-                                                                size=len(df_filtered))
+            df_filtered[label_column] = randgen.randint(trim_min,
+                                                        trim_max + 1,
+                                                        size=len(df_filtered))
 
         # make sure there are no missing features in the data
         missing_features = set(feature_names).difference(df_filtered.columns)
@@ -1489,18 +1676,16 @@ class FeaturePreprocessor:
             # make sure all features selected for model building are numeric
             # and also replace any non-numeric feature values in already
             # excluded data with NaNs for consistency
+            (df_filtered,
+             df_excluded) = self.filter_on_columns(df_filtered,
+                                                   feature_names,
+                                                   'spkitemid',
+                                                   exclude_zero_sd=exclude_zero_sd,
+                                                   df_excluded=df_excluded)
+
             for feat in feature_names:
                 df_excluded[feat] = pd.to_numeric(df_excluded[feat],
                                                   errors='coerce').astype(float)
-                newdf, newdf_excluded = self.filter_on_column(df_filtered,
-                                                              feat,
-                                                              'spkitemid',
-                                                              exclude_zeros=False,
-                                                              exclude_zero_sd=exclude_zero_sd)
-                del df_filtered
-                df_filtered = newdf
-                with np.errstate(divide='ignore'):
-                    df_excluded = pd.concat([df_excluded, newdf_excluded], sort=True)
 
             # make sure that the remaining data frame is not empty
             if len(df_filtered) == 0:
@@ -1510,7 +1695,9 @@ class FeaturePreprocessor:
 
             # Raise warning if we excluded features that were
             # specified in the .json file because sd == 0.
-            omitted_features = set(requested_feature_names).difference(df_filtered.columns)
+            filtered_columns = set(df_filtered.columns)
+            omitted_features = [feature for feature in requested_feature_names
+                                if feature not in filtered_columns]
             if omitted_features:
                 raise ValueError("The following requested features "
                                  "were excluded because their standard "
@@ -1520,7 +1707,7 @@ class FeaturePreprocessor:
                                  "tool".format(', '.join(omitted_features)))
             # Update the feature names
             feature_names = [feature for feature in feature_names
-                             if feature in df_filtered]
+                             if feature in filtered_columns]
         else:
             raise KeyError("DataFrame does not contain "
                            "columns for all features specified in "
@@ -1540,10 +1727,13 @@ class FeaturePreprocessor:
         # check the values for length column. We do this after filtering
         # to make sure we have removed responses that have not been
         # processed correctly. Else rename length column to
-        # ##ORIGINAL_NAME##.
+        # ##ORIGINAL_NAME##. The standard deviation of the lengths is
+        # zero exactly when they are all the same, which is cheaper to
+        # check; it is undefined for a single response, so we keep that.
         if (length_column and
-            (len(df_filtered[df_filtered['length'].isnull()]) != 0 or
-                df_filtered['length'].std() <= 0)):
+            (df_filtered['length'].isnull().any() or
+                (len(df_filtered) > 1 and
+                 df_filtered['length'].min() == df_filtered['length'].max()))):
             logging.warning("The {} column either has missing values or a standard "
                             "deviation <= 0. No length-based analysis will be "
                             "provided. The column will be renamed as ##{}## and "
@@ -1566,63 +1756,80 @@ class FeaturePreprocessor:
                                  "left for analysis".format(min_candidate_items))
 
             # redefine df_filtered
-            df_filtered = df_filtered_candidates.copy()
+            df_filtered = df_filtered_candidates
 
             # update df_excluded
             df_excluded = pd.concat([df_excluded, df_excluded_candidates], sort=True)
 
         # create separate data frames for features and sc1, all other
-        # information, and responses excluded during filtering
-        not_other_columns = set()
+        # information, and responses excluded during filtering; we first
+        # work out which columns go into each data frame so that every
+        # data frame is created with a single selection
+        columns = df_filtered.columns
+        filtered_columns = set(columns)
         feature_columns = ['spkitemid', 'sc1'] + feature_names
-        df_filtered_features = df_filtered[feature_columns]
-        not_other_columns.update(feature_columns)
 
         metadata_columns = ['spkitemid'] + subgroups
         if candidate_column:
             metadata_columns.append('candidate')
-        df_filtered_metadata = df_filtered[metadata_columns]
-        not_other_columns.update(metadata_columns)
 
-        df_filtered_length = pd.DataFrame()
         length_columns = ['spkitemid', 'length']
-        if length_column and 'length' in df_filtered:
-            df_filtered_length = df_filtered[length_columns]
+        has_length = length_column and 'length' in filtered_columns
+
+        human_score_columns = ['spkitemid', 'sc1', 'sc2']
+        has_human_scores = second_human_score_column and 'sc2' in filtered_columns
+
+        not_other_columns = set(feature_columns).union(metadata_columns)
+        if has_length:
             not_other_columns.update(length_columns)
+        if has_human_scores:
+            not_other_columns.add('sc2')
+
+        # all other columns along with 'spkitemid'
+        other_columns = ['spkitemid'] + [column for column in columns
+                                         if column not in not_other_columns]
+
+        # look up the position of each column once and select
+        # the columns for each data frame by position
+        column_positions = {column: idx for idx, column in enumerate(columns)}
+
+        def select_columns(column_names):
+            positions = [column_positions[column] for column in column_names]
+            return df_filtered.iloc[:, positions]
+
+        df_filtered_features = select_columns(feature_columns)
+        df_filtered_metadata = select_columns(metadata_columns)
+        df_filtered_other_columns = select_columns(other_columns)
+
+        df_filtered_length = pd.DataFrame()
+        if has_length:
+            df_filtered_length = select_columns(length_columns)
 
         df_filtered_human_scores = pd.DataFrame()
-        human_score_columns = ['spkitemid', 'sc1', 'sc2']
-        if second_human_score_column and 'sc2' in df_filtered:
-            df_filtered_human_scores = df_filtered[human_score_columns].copy()
-            not_other_columns.update(['sc2'])
+        if has_human_scores:
+            df_filtered_human_scores = select_columns(human_score_columns).copy()
 
             # filter out any non-numeric value rows
             # as well as zeros, if we were asked to
-            df_filtered_human_scores['sc2'] = pd.to_numeric(df_filtered_human_scores['sc2'],
-                                                            errors='coerce').astype(float)
+            sc2_values = self.coerce_to_float_array(df_filtered_human_scores['sc2'])
             if exclude_zero_scores:
-                df_filtered_human_scores['sc2'] = df_filtered_human_scores['sc2'].replace(0,
-                                                                                          np.nan)
+                sc2_values = np.where(sc2_values == 0, np.nan, sc2_values)
+            df_filtered_human_scores['sc2'] = sc2_values
 
         # we need to make sure that `spkitemid` is the first column
         df_excluded = df_excluded[['spkitemid'] + [column for column in df_excluded
                                                    if column != 'spkitemid']]
 
-        # now extract all other columns and add 'spkitemid'
-        other_columns = ['spkitemid'] + [column for column in df_filtered
-                                         if column not in not_other_columns]
-        df_filtered_other_columns = df_filtered[other_columns]
-
-        return (df_filtered_features,
-                df_filtered_metadata,
-                df_filtered_other_columns,
-                df_excluded,
-                df_filtered_length,
-                df_filtered_human_scores,
-                df_responses_with_excluded_flags,
-                trim_min,
-                trim_max,
-                feature_names)
+        return FilteredData(features=df_filtered_features,
+                            metadata=df_filtered_metadata,
+                            other_columns=df_filtered_other_columns,
+                            excluded=df_excluded,
+                            length=df_filtered_length,
+                            human_scores=df_filtered_human_scores,
+                            flagged_responses=df_responses_with_excluded_flags,
+                            trim_min=trim_min,
+                            trim_max=trim_max,
+                            feature_names=feature_names)
 
     def process_data_rsmtool(self, config_obj, data_container_obj):
         """
@@ -1825,31 +2032,29 @@ class FeaturePreprocessor:
                              "used as a model feature.".format(second_human_score_column))
 
         # Specify column names that cannot be used as features
-        reserved_column_names = list(set(['spkitemid', 'spkitemlab',
-                                          'itemType', 'r1', 'r2', 'score',
-                                          'sc', 'sc1', 'adj',
-                                          train_label_column,
-                                          test_label_column,
-                                          id_column] + subgroups + list(flag_column_dict.keys())))
+        reserved_column_names = set(['spkitemid', 'spkitemlab',
+                                     'itemType', 'r1', 'r2', 'score',
+                                     'sc', 'sc1', 'adj'])
+        reserved_column_names.update(column for column in [train_label_column,
+                                                           test_label_column,
+                                                           id_column] if column)
+        reserved_column_names.update(subgroups)
+        reserved_column_names.update(flag_column_dict)
 
         # if `second_human_score_column` is specified, then
-        # we need to add the original name as well as `sc2` to the list of reserved column
+        # we need to add the original name as well as `sc2` to the set of reserved column
         # names. And same for 'length' and 'candidate', if `length_column`
         # and `candidate_column` are specified. We add both names to
         # simplify things downstream since neither the original name nor
         # the standardized name should be used as feature names
         if second_human_score_column:
-            reserved_column_names.append(second_human_score_column)
-            reserved_column_names.append('sc2')
+            reserved_column_names.update([second_human_score_column, 'sc2'])
         if length_column:
-            reserved_column_names.append(length_column)
-            reserved_column_names.append('length')
+            reserved_column_names.update([length_column, 'length'])
         if candidate_column:
-            reserved_column_names.append(candidate_column)
-            reserved_column_names.append('candidate')
+            reserved_column_names.update([candidate_column, 'candidate'])
 
-        # remove duplicates (if any) from the list of reserved column names
-        reserved_column_names = list(set(reserved_column_names))
+        reserved_column_names = frozenset(reserved_column_names)
 
         # Make sure that the training data as specified in the
         # config file actually exists on disk and if it does,
@@ -1857,33 +2062,34 @@ class FeaturePreprocessor:
         # zero standard deviation. Also double check that the requested
         # features exist in the data or obtain the feature names if
         # no feature file was given.
-        (df_train_features,
-         df_train_metadata,
-         df_train_other_columns,
-         df_train_excluded,
-         df_train_length,
-         _,
-         df_train_flagged_responses,
-         used_trim_min,
-         used_trim_max,
-         feature_names) = self.filter_data(train,
-                                           train_label_column,
-                                           id_column,
-                                           length_column,
-                                           None,
-                                           candidate_column,
-                                           requested_features,
-                                           reserved_column_names,
-                                           spec_trim_min,
-                                           spec_trim_max,
-                                           flag_column_dict,
-                                           subgroups,
-                                           exclude_zero_scores=exclude_zero_scores,
-                                           exclude_zero_sd=True,
-                                           feature_subset_specs=feature_subset,
-                                           feature_subset=feature_subset_field,
-                                           min_candidate_items=min_items,
-                                           use_fake_labels=use_fake_train_labels)
+        train_data = self.filter_data(train,
+                                      train_label_column,
+                                      id_column,
+                                      length_column,
+                                      None,
+                                      candidate_column,
+                                      requested_features,
+                                      reserved_column_names,
+                                      spec_trim_min,
+                                      spec_trim_max,
+                                      flag_column_dict,
+                                      subgroups,
+                                      exclude_zero_scores=exclude_zero_scores,
+                                      exclude_zero_sd=True,
+                                      feature_subset_specs=feature_subset,
+                                      feature_subset=feature_subset_field,
+                                      min_candidate_items=min_items,
+                                      use_fake_labels=use_fake_train_labels)
+
+        df_train_features = train_data.features
+        df_train_metadata = train_data.metadata
+        df_train_other_columns = train_data.other_columns
+        df_train_excluded = train_data.excluded
+        df_train_length = train_data.length
+        df_train_flagged_responses = train_data.flagged_responses
+        used_trim_min = train_data.trim_min
+        used_trim_max = train_data.trim_max
+        feature_names = train_data.feature_names
 
         # Generate feature specifications now that we know what features to use
         if generate_feature_specs_automatically:
@@ -1909,22 +2115,19 @@ class FeaturePreprocessor:
                             'score analysis will be performed, even '
                             'if requested.')
 
-            df_test_features = df_train_features.copy()
-            df_test_metadata = df_train_metadata.copy()
+            # the test frames are the same objects as the training frames
+            # since none of them are modified in place downstream; the only
+            # exception is the excluded responses frame, which is annotated
+            # in place by `Analyzer.analyze_excluded_responses()`
+            df_test_features = df_train_features
+            df_test_metadata = df_train_metadata
             df_test_excluded = df_train_excluded.copy()
-            df_test_other_columns = df_train_other_columns.copy()
-            df_test_flagged_responses = df_train_flagged_responses.copy()
+            df_test_other_columns = df_train_other_columns
+            df_test_flagged_responses = df_train_flagged_responses
             df_test_human_scores = pd.DataFrame()
         else:
 
-            (df_test_features,
-             df_test_metadata,
-             df_test_other_columns,
-             df_test_excluded,
-             _,
-             df_test_human_scores,
-             df_test_flagged_responses,
-             _, _, _) = self.filter_data(test,
+            test_data = self.filter_data(test,
                                          test_label_column,
                                          id_column,
                                          None,
@@ -1941,6 +2144,13 @@ class FeaturePreprocessor:
                                          min_candidate_items=min_items,
                                          use_fake_labels=use_fake_test_labels)
 
+            df_test_features = test_data.features
+            df_test_metadata = test_data.metadata
+            df_test_other_columns = test_data.other_columns
+            df_test_excluded = test_data.excluded
+            df_test_human_scores = test_data.human_scores
+            df_test_flagged_responses = test_data.flagged_responses
+
         logging.info('Pre-processing training and test set features')
         (df_train_preprocessed_features,
          df_test_preprocessed_features,
@@ -2174,10 +2384,12 @@ class FeaturePreprocessor:
                                               candidate_column)
 
         # check that the id_column contains unique values
-        if df_pred['spkitemid'].size != df_pred['spkitemid'].unique().size:
+        duplicated_ids = df_pred['spkitemid'].duplicated()
+        if duplicated_ids.any():
+            example_ids = df_pred.loc[duplicated_ids, 'spkitemid'].head(5).tolist()
             raise ValueError("The data contains duplicate response IDs "
-                             "in '{}'. Please make sure all response IDs "
-                             "are unique and re-run the tool.".format(id_column))
+                             "in '{}' (e.g. {}). Please make sure all response IDs "
+                             "are unique and re-run the tool.".format(id_column, example_ids))
 
         df_pred = self.check_subgroups(df_pred, subgroups)
 
@@ -2221,8 +2433,7 @@ class FeaturePreprocessor:
                              "non-numeric machine scores. No further analysis "
                              "can be run. ")
 
-        with np.errstate(divide='ignore'):
-            df_excluded = pd.concat([df_excluded, newdf_excluded], sort=True)
+        df_excluded = pd.concat([df_excluded, newdf_excluded], sort=True)
 
         # if requested, exclude the candidates with less than X responses
         # left after filtering
@@ -2239,7 +2450,7 @@ class FeaturePreprocessor:
                                  "left for analysis".format(str(min_items_per_candidate)))
 
             # redefine df_filtered_pred
-            df_filtered_pred = df_filtered_candidates.copy()
+            df_filtered_pred = df_filtered_candidates
 
             # update df_excluded
             df_excluded = pd.concat([df_excluded, df_excluded_candidates], sort=True)
@@ -2297,15 +2508,16 @@ class FeaturePreprocessor:
 
         df_test_human_scores = pd.DataFrame()
         human_score_columns = ['spkitemid', 'sc1', 'sc2']
-        if second_human_score_column and 'sc2' in df_filtered_pred:
+        pred_columns = df_filtered_pred.columns
+        if second_human_score_column and 'sc2' in pred_columns:
             df_test_human_scores = df_filtered_pred[human_score_columns].copy()
             not_other_columns.update(['sc2'])
             # filter out any non-numeric values nows
             # as well as zeros, if we were asked to
-            df_test_human_scores['sc2'] = pd.to_numeric(df_test_human_scores['sc2'],
-                                                        errors='coerce').astype(float)
+            sc2_values = self.coerce_to_float_array(df_test_human_scores['sc2'])
             if exclude_zero_scores:
-                df_test_human_scores['sc2'] = df_test_human_scores['sc2'].replace(0, np.nan)
+                sc2_values = np.where(sc2_values == 0, np.nan, sc2_values)
+            df_test_human_scores['sc2'] = sc2_values
 
         # remove 'spkitemid' from `not_other_columns`
         # because we want that in the other columns
@@ -2313,7 +2525,7 @@ class FeaturePreprocessor:
         not_other_columns.remove('spkitemid')
 
         # extract all of the other columns in the predictions file
-        other_columns = [column for column in df_filtered_pred.columns
+        other_columns = [column for column in pred_columns
                          if column not in not_other_columns]
 
         df_pred_other_columns = df_filtered_pred[other_columns]
@@ -2459,10 +2671,12 @@ class FeaturePreprocessor:
                                                candidate_column=candidate_column)
 
         # check that the id_column contains unique values
-        if df_input['spkitemid'].size != df_input['spkitemid'].unique().size:
-            raise ValueError("The data contains repeated response IDs in {}. "
+        duplicated_ids = df_input['spkitemid'].duplicated()
+        if duplicated_ids.any():
+            example_ids = df_input.loc[duplicated_ids, 'spkitemid'].head(5).tolist()
+            raise ValueError("The data contains repeated response IDs in {} (e.g. {}). "
                              "Please make sure all response IDs are unique and "
-                             "re-run the tool.".format(id_column))
+                             "re-run the tool.".format(id_column, example_ids))
 
         (df_features_preprocessed,
          df_excluded) = self.preprocess_new_data(df_input,
@@ -2651,19 +2865,14 @@ class FeaturePreprocessor:
 
         # first we need to filter out NaNs and any other
         # weird features, the same way we did for rsmtool.
-        df_filtered = df_features.copy()
-        df_excluded = pd.DataFrame(columns=df_filtered.columns)
+        df_excluded = pd.DataFrame(columns=df_features.columns)
 
-        for feature_name in required_features:
-            newdf, newdf_excluded = self.filter_on_column(df_filtered,
-                                                          feature_name,
-                                                          'spkitemid',
-                                                          exclude_zeros=False,
-                                                          exclude_zero_sd=False)
-            del df_filtered
-            df_filtered = newdf
-            with np.errstate(divide='ignore'):
-                df_excluded = pd.concat([df_excluded, newdf_excluded], sort=True)
+        (df_filtered,
+         df_excluded) = self.filter_on_columns(df_features,
+                                               required_features,
+                                               'spkitemid',
+                                               exclude_zero_sd=False,
+                                               df_excluded=df_excluded)
 
         # make sure that the remaining data frame is not empty
         if len(df_filtered) == 0:
@@ -2673,6 +2882,7 @@ class FeaturePreprocessor:
 
         df_features = df_filtered.copy()
         df_features_preprocess = df_features.copy()
+        df_excluded_original_list = []
         for feature_name in required_features:
 
             feature_values = df_features_preprocess[feature_name].values
@@ -2715,9 +2925,7 @@ class FeaturePreprocessor:
                     # but make sure we are adding the original values, not the
                     # preprocessed ones
                     missing_values = df_features['spkitemid'].isin(newdf_excluded['spkitemid'])
-
-                    df_excluded_original = df_features[missing_values].copy()
-                    df_excluded = pd.merge(df_excluded, df_excluded_original, how='outer')
+                    df_excluded_original_list.append(df_features[missing_values])
 
             # print(standardized_features)
             if standardize_features:
@@ -2732,6 +2940,12 @@ class FeaturePreprocessor:
             df_features_preprocess[feature_name] = (df_features_preprocess[feature_name] *
                                                     feature_sign)
 
+        # add all of the responses excluded after the transformations
+        # to the excluded responses at once rather than one at a time
+        if df_excluded_original_list:
+            df_excluded_original = pd.concat(df_excluded_original_list)
+            df_excluded = pd.merge(df_excluded, df_excluded_original, how='outer')
+
         # we need to make sure that `spkitemid` is the first column
         df_excluded = df_excluded[['spkitemid'] + [column for column in df_excluded
                                                    if column != 'spkitemid']]
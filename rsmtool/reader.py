@@ -11,7 +11,6 @@ and converting them to DataContainer objects.
 
 import warnings
 
-from functools import partial
 from os.path import (abspath,
                      exists,
                      join,
@@ -21,6 +20,18 @@ import pandas as pd
 
 from rsmtool.container import DataContainer
 
+# do we have python-calamine installed? if so, and if our
+# version of pandas supports it as an engine, we use it
+# to read Excel files since it is much faster than the
+# default engines and supports both .xls and .xlsx files
+try:
+    import python_calamine  # noqa
+except ImportError:
+    HAS_CALAMINE = False
+else:
+    pandas_version = tuple(int(part) for part in pd.__version__.split('.')[:2])
+    HAS_CALAMINE = pandas_version >= (2, 2)
+
 
 def read_jsonlines(filename, converters=None):
     """
@@ -55,7 +66,7 @@ def read_jsonlines(filename, converters=None):
                          "any undefined values are written out as `null` and not `NaN`.")
 
     # make sure we didn't get a plain json
-    if type(df.columns) == pd.RangeIndex:
+    if isinstance(df.columns, pd.RangeIndex):
         raise ValueError("It looks like {} is a simple json file. "
                          "Please check documentation (for the expected "
                          "file format".format(filename))
@@ -74,6 +85,19 @@ def read_jsonlines(filename, converters=None):
     return df
 
 
+# the default keyword arguments used to read Excel files
+EXCEL_READER_KWARGS = {'engine': 'calamine'} if HAS_CALAMINE else {}
+
+# map each supported file extension to the reader function
+# and the default keyword arguments used to read such files
+FILE_READERS = {'.csv': (pd.read_csv, {'sep': ',', 'memory_map': True}),
+                '.tsv': (pd.read_csv, {'sep': '\t', 'memory_map': True}),
+                '.xls': (pd.read_excel, EXCEL_READER_KWARGS),
+                '.xlsx': (pd.read_excel, EXCEL_READER_KWARGS),
+                '.sas7bdat': (pd.read_sas, {'encoding': 'latin-1'}),
+                '.jsonlines': (read_jsonlines, {})}
+
+
 def try_to_load_file(filename,
                      converters=None,
                      raise_error=False,
@@ -206,7 +230,13 @@ class DataReader:
         self.file_converters = {} if file_converters is None else file_converters
 
     @staticmethod
-    def read_from_file(filename, converters=None, **kwargs):
+    def read_from_file(filename,
+                       converters=None,
+                       usecols=None,
+                       dtype=None,
+                       chunksize=None,
+                       chunk_filter=None,
+                       **kwargs):
         """
         Read a CSV/TSV/XLS/XLSX/JSONLINES/SAS7BDAT file and return a data frame.
 
@@ -218,6 +248,29 @@ class DataReader:
             A dictionary specifying how the types of the columns
             in the file should be converted. Specified in the same
             format as for `pd.read_csv() <https://pandas.pydata.org/pandas-docs/stable/reference/api/pandas.read_csv.html>`_.
+        usecols : list or callable, optional
+            The subset of columns to read. Specified in the same
+            format as for `pd.read_csv()`. Only supported for
+            CSV/TSV files.
+            Defaults to None.
+        dtype : dict, optional
+            A dictionary specifying the types of the columns
+            in the file. Specified in the same format as for
+            `pd.read_csv()`. Only supported for CSV/TSV/XLS/XLSX
+            files.
+            Defaults to None.
+        chunksize : int, optional
+            If specified, CSV/TSV files are read in chunks of this
+            many rows which are then concatenated. This reduces the
+            peak memory used when reading very large files. It is
+            ignored for all other file types.
+            Defaults to None.
+        chunk_filter : callable, optional
+            A function that takes a data frame and returns a
+            (possibly smaller) data frame. If specified along with
+            `chunksize`, it is applied to each chunk before the
+            chunks are concatenated.
+            Defaults to None.
 
         Returns
         -------
@@ -228,6 +281,10 @@ class DataReader:
         ------
         ValueError
             If the file has an extension that we do not support
+        ValueError
+            If `usecols` is specified for a file that is not a
+            CSV/TSV file or `dtype` is specified for a file that
+            is not a CSV/TSV/XLS/XLSX file.
         pd.parser.CParserError
             If the file is badly formatted or corrupt.
 
@@ -239,31 +296,55 @@ class DataReader:
 
         file_extension = splitext(filename)[1].lower()
 
-        if file_extension in ['.csv', '.tsv']:
-            sep = '\t' if file_extension == '.tsv' else ','
-            do_read = partial(pd.read_csv, sep=sep, converters=converters)
-        elif file_extension in ['.xls', '.xlsx']:
-            do_read = partial(pd.read_excel, converters=converters)
-        elif file_extension in ['.sas7bdat']:
-            if 'encoding' not in kwargs:
-                encoding = 'latin-1'
-            else:
-                encoding = kwargs.pop('encoding')
-            do_read = partial(pd.read_sas, encoding=encoding)
-        elif file_extension in ['.jsonlines']:
-            do_read = partial(read_jsonlines, converters=converters)
-        else:
+        try:
+            do_read, default_kwargs = FILE_READERS[file_extension]
+        except KeyError:
             raise ValueError("RSMTool only supports files in .csv, "
                              ".tsv, .xls/.xlsx, or .sas7bdat format. "
                              "The file should have the extension "
                              "which matches its format. The file you "
                              "passed is: {}.".format(filename))
 
+        reader_kwargs = dict(default_kwargs, **kwargs)
+
+        # SAS files do not support converters
+        if file_extension != '.sas7bdat':
+            reader_kwargs['converters'] = converters
+
+        # only pass the column subset and types if they were
+        # specified since not all readers support them; note that
+        # `pd.read_excel()` does not accept column names in `usecols`
+        if usecols is not None and file_extension not in ['.csv', '.tsv']:
+            raise ValueError("The `usecols` argument is only supported for "
+                             ".csv and .tsv files. The file you passed "
+                             "is: {}.".format(filename))
+        if dtype is not None and file_extension in ['.sas7bdat', '.jsonlines']:
+            raise ValueError("The `dtype` argument is only supported for "
+                             ".csv, .tsv, and .xls/.xlsx files. The file "
+                             "you passed is: {}.".format(filename))
+        if usecols is not None:
+            reader_kwargs['usecols'] = usecols
+        if dtype is not None:
+            reader_kwargs['dtype'] = dtype
+
+        # read CSV/TSV files in chunks if we are asked to so
+        # that we never hold the raw parser buffers for the
+        # whole file in memory at the same time
+        read_in_chunks = chunksize is not None and do_read is pd.read_csv
+        if read_in_chunks:
+            reader_kwargs['chunksize'] = chunksize
+
         # ignore warnings about mixed data types for large files
         with warnings.catch_warnings():
             warnings.filterwarnings('ignore', category=pd.io.common.DtypeWarning)
             try:
-                df = do_read(filename, **kwargs)
+                if read_in_chunks:
+                    chunks = do_read(filename, **reader_kwargs)
+                    if chunk_filter is not None:
+                        chunks = (chunk_filter(chunk) for chunk in chunks)
+                    df = pd.concat(chunks, ignore_index=True)
+                else:
+                    df = do_read(filename, **reader_kwargs)
             except pd.parser.CParserError:
                 raise pd.parser.CParserError('Cannot read {}. Please check that it is '
                                              'not corrupt or in an incompatible format. '
@@ -316,18 +397,17 @@ class DataReader:
         located_paths = []
         for filepath in filepaths:
 
-            retval = None
-            alternate_path = abspath(join(config_dir, filepath))
-
             # if the given path exists as is, convert
             # that to an absolute path and return
             if exists(filepath):
                 retval = abspath(filepath)
 
             # otherwise check if it exists relative
-            # to the directory that contains the main config file
-            elif exists(alternate_path):
-                retval = alternate_path
+            # to the directory that contains the main config file;
+            # we only compute this alternate path if we need it
+            else:
+                alternate_path = abspath(join(config_dir, filepath))
+                retval = alternate_path if exists(alternate_path) else None
 
             located_paths.append(retval)
 
@@ -173,14 +173,14 @@ class Reporter:
             If any of the files cannot be found.
         """
 
-        custom_report_sections = []
-        for cs_path in custom_report_section_paths:
-            cs_location = DataReader.locate_files(cs_path, config_dir)
+        # locate all of the sections in a single call
+        custom_report_sections = DataReader.locate_files(list(custom_report_section_paths),
+                                                         config_dir)
+        for cs_path, cs_location in zip(custom_report_section_paths,
+                                        custom_report_sections):
             if not cs_location:
                 raise FileNotFoundError("Error: custom section not found at "
                                         "{}.".format(cs_path))
-            else:
-                custom_report_sections.append(cs_location)
         return custom_report_sections
 
     @staticmethod
@@ -28,10 +28,24 @@ from IPython.display import (display,
 
 from skll.data import safe_float as string_to_number
 
+# do we have orjson installed? if so, we use its
+# faster parser to load JSON configuration files
+try:
+    import orjson
+except ImportError:
+    HAS_ORJSON = False
+else:
+    HAS_ORJSON = True
+
 
 HTML_STRING = ("""<li><b>{}</b>: <a href="{}" download>{}</a></li>""")
 
 
+# regular expression to identify comments in JSON files
+COMMENT_RE = re.compile(r'(^)?[^\S\n]*/(?:\*(.*?)\*/[^\S\n]*|/[^\n]*)($)?',
+                        re.DOTALL | re.MULTILINE)
+
+
 BUILTIN_MODELS = ['LinearRegression',
                   'EqualWeightsLR',
                   'ScoreWeightedLR',
@@ -227,6 +241,11 @@ CHECK_FIELDS = {'rsmtool': {'required': ['experiment_id',
                                               'section_order']}}
 
 
+# all of the fields that are allowed in each context
+CONTEXT_FIELDS = {context: frozenset(fields['required'] + fields['optional'])
+                  for context, fields in CHECK_FIELDS.items()}
+
+
 POSSIBLE_EXTENSIONS = ['csv', 'xlsx', 'tsv']
 
 ID_FIELDS = {'rsmtool': 'experiment_id',
@@ -332,24 +351,23 @@ def parse_json_with_comments(filename):
     https://web.archive.org/web/20150520154859/http://www.lifl.fr/~riquetd/parse-a-json-file-with-comments.html
     """
 
-    # Regular expression to identify comments
-    comment_re = re.compile(r'(^)?[^\S\n]*/(?:\*(.*?)\*/[^\S\n]*|/[^\n]*)($)?',
-                            re.DOTALL | re.MULTILINE)
-
     with open(filename) as file_buff:
-        content = ''.join(file_buff.readlines())
+        content = file_buff.read()
 
-        # Looking for comments
-        match = comment_re.search(content)
-        while match:
+    # remove all comments in a single pass
+    content = COMMENT_RE.sub('', content)
 
-            # single line comment
-            content = content[:match.start()] + content[match.end():]
-            match = comment_re.search(content)
+    # Return JSON object; `orjson` is stricter than the standard
+    # library parser (e.g., it does not allow ``NaN``) so we fall
+    # back to the latter for anything that `orjson` rejects
+    if HAS_ORJSON:
+        try:
+            return orjson.loads(content)
+        except orjson.JSONDecodeError:
+            pass
 
-        # Return JSON object
-        config = json.loads(content)
-        return config
+    config = json.loads(content)
+    return config
 
 
 def compute_expected_scores_from_model(model, featureset, min_score, max_score):
@@ -590,6 +590,11 @@ class TestConfiguration:
         output_dict = config.check_flag_column()
         eq_(output_dict, {"advisory flag": [1, 2, 3]})
 
+    def test_check_flag_column_convert_tuple_to_list(self):
+        config = Configuration({"flag_column": {"advisory flag": (1, 2)}})
+        output_dict = config.check_flag_column()
+        eq_(output_dict, {"advisory flag": [1, 2]})
+
     def test_check_flag_column_no_values(self):
         config = Configuration({"flag_column": None})
         flag_dict = config.check_flag_column()
@@ -759,6 +764,19 @@ class TestConfiguration:
         rmtree('output')
         eq_(config_new, dictionary)
 
+    def test_save_format(self):
+        dictionary = {"experiment_id": '001',
+                      "description": 'Caf\u00e9 experiment',
+                      "trim_tolerance": float('nan')}
+        config = Configuration(dictionary)
+        config.save()
+
+        out_path = 'output/001_rsmtool.json'
+        with open(out_path) as buff:
+            content = buff.read()
+        rmtree('output')
+        eq_(content, json.dumps(dictionary, indent=4, separators=(',', ': ')))
+
     def test_save_rsmcompare(self):
         dictionary = {"comparison_id": '001'}
         config = Configuration(dictionary,
@@ -816,6 +834,15 @@ class TestConfiguration:
         trim_min_max_tolerance = config.get_trim_min_max_tolerance()
         eq_(trim_min_max_tolerance, (1.0, 6.0, 0.49))
 
+    def test_get_trim_min_max_tolerance_zero(self):
+        dictionary = {"experiment_id": '001', 'trim_min': 0, 'trim_max': 6}
+        config = Configuration(dictionary)
+        (trim_min,
+         trim_max,
+         trim_tolerance) = config.get_trim_min_max_tolerance()
+        eq_((trim_min, trim_max, trim_tolerance), (0.0, 6.0, None))
+        ok_(isinstance(trim_min, float))
+
     def test_get_trim_min_max_deprecated(self):
         dictionary = {"experiment_id": '001', 'trim_min': 1, 'trim_max': 6}
         config = Configuration(dictionary)
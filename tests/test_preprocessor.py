@@ -160,6 +160,18 @@ class TestFeaturePreprocessor:
         df_out = FeaturePreprocessor.check_subgroups(df, subgroups)
         assert_frame_equal(df_out, df_expected)
 
+    def test_check_subgroups_replace_empty_mixed_values(self):
+        df = pd.DataFrame({'a': ['1', '\t', np.nan],
+                           'b': [1, 2, 3],
+                           'd': [1, ' ', 'ab']})
+
+        subgroups = ['a', 'b', 'd']
+        df_expected = pd.DataFrame({'a': ['1', 'No info', np.nan],
+                                    'b': [1, 2, 3],
+                                    'd': [1, 'No info', 'ab']})
+        df_out = FeaturePreprocessor.check_subgroups(df, subgroups)
+        assert_frame_equal(df_out, df_expected)
+
     def test_filter_on_column(self):
 
         bad_df = pd.DataFrame({'spkitemlab': np.arange(1, 9, dtype='int64'),
@@ -232,6 +244,36 @@ class TestFeaturePreprocessor:
         assert_frame_equal(output_df, good_df)
         assert_frame_equal(output_excluded_df, bad_df)
 
+    def test_filter_on_columns(self):
+        # filtering on several columns at once should give the same
+        # results as filtering on each of the columns in turn
+        df = pd.DataFrame({'spkitemid': ['a', 'b', 'c', 'd', 'e', 'f'],
+                           'feature1': ['1', 'TD', '3', '4', '5', '6'],
+                           'feature2': [2.0, 3.0, np.nan, 2.0, 2.0, np.inf],
+                           'feature3': ['x', '1', '2', 'y', '3', '4']})
+
+        df_expected = df.copy()
+        df_excluded_expected = df.iloc[0:0]
+        for feature in ['feature1', 'feature2', 'feature3']:
+            df_expected, df_excluded = self.fpp.filter_on_column(df_expected,
+                                                                 feature,
+                                                                 'spkitemid',
+                                                                 exclude_zeros=False,
+                                                                 exclude_zero_sd=True)
+            df_excluded_expected = pd.concat([df_excluded_expected, df_excluded], sort=True)
+
+        df_output, df_excluded_output = self.fpp.filter_on_columns(df,
+                                                                   ['feature1',
+                                                                    'feature2',
+                                                                    'feature3'],
+                                                                   'spkitemid',
+                                                                   exclude_zero_sd=True,
+                                                                   df_excluded=df.iloc[0:0])
+
+        assert_frame_equal(df_output, df_expected)
+        assert_frame_equal(df_excluded_output, df_excluded_expected)
+        ok_('feature2' not in df_output)
+
     def test_filter_on_flag_column_empty_flag_dictionary(self):
         # no flags specified, keep the data frame as is
         df = pd.DataFrame({'spkitemid': ['a', 'b', 'c', 'd'],
@@ -708,6 +750,21 @@ class TestFeaturePreprocessor:
         model_name = 'random_model'
         self.fpp.check_model_name(model_name)
 
+    def test_coerce_to_float_array(self):
+
+        values = pd.Series(['1', 'TD', 2, None, '3.5'])
+        expected = np.array([1.0, np.nan, 2.0, np.nan, 3.5])
+        actual = FeaturePreprocessor.coerce_to_float_array(values)
+        assert_array_equal(actual, expected)
+
+    def test_coerce_to_float_array_with_numeric_values(self):
+
+        values = pd.Series([True, False, True])
+        expected = np.array([1.0, 0.0, 1.0])
+        actual = FeaturePreprocessor.coerce_to_float_array(values)
+        eq_(actual.dtype, np.float64)
+        assert_array_equal(actual, expected)
+
     def test_trim(self):
 
         values = np.array([1.4, 8.5, 7.4])
@@ -1246,6 +1303,18 @@ class TestFeatureSpecsProcessor:
                                          'transform': ['raw', 'inv', 'sqrt']})
         FeatureSpecsProcessor.validate_feature_specs(df_feature_specs)
 
+    def test_validate_feature_duplicate_feature_message(self):
+        df_feature_specs = pd.DataFrame({'feature': ['f1', 'f1', 'f3'],
+                                         'sign': ['+', '+', '-'],
+                                         'transform': ['raw', 'inv', 'sqrt']})
+        try:
+            FeatureSpecsProcessor.validate_feature_specs(df_feature_specs)
+        except ValueError as error:
+            eq_(str(error), "The following feature names  are duplicated in "
+                            "the feature file: Index(['f1'], dtype='object')")
+        else:
+            raise AssertionError('No error raised for duplicate features')
+
     @raises(KeyError)
     def test_validate_feature_missing_feature_column(self):
         df_feature_specs = pd.DataFrame({'FeatureName': ['f1', 'f1', 'f3'],
@@ -1321,3 +1390,11 @@ class TestFeatureSubsetProcessor:
         feature_specs = pd.DataFrame({'Feature': ['f1', 'f2', 'f3'],
                                       'sign_SYS1': ['+1', '-1', '+1']})
         FeatureSubsetProcessor.check_feature_subset_file(feature_specs, sign='SYS1')
+
+    def test_check_feature_subset_file_with_subset_and_sign(self):
+        feature_specs = pd.DataFrame({'Feature': ['f1', 'f2', 'f3'],
+                                      'subset1': [0, 1, 0],
+                                      'Sign_SYS1': ['+', '-', '+']})
+        FeatureSubsetProcessor.check_feature_subset_file(feature_specs,
+                                                         'subset1',
+                                                         sign='SYS1')
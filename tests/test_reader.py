@@ -145,6 +145,55 @@ class TestDataReader:
         for extension in ['csv', 'tsv', 'xls', 'xlsx', 'CSV', 'TSV']:
             yield self.check_read_from_file, extension
 
+    def test_read_from_file_with_usecols_and_dtype(self):
+        name = TestDataReader.make_file_from_ext(self.df_train, 'csv')
+        self.filepaths.append(name)
+
+        df_read = DataReader.read_from_file(name,
+                                            converters={'id': str},
+                                            usecols=['id', 'feature1'],
+                                            dtype={'feature1': 'float64'})
+        df_expected = self.df_train[['id', 'feature1']].astype({'feature1': 'float64'})
+        assert_frame_equal(df_expected, df_read)
+
+    @raises(ValueError)
+    def test_read_from_file_xlsx_with_usecols(self):
+        name = TestDataReader.make_file_from_ext(self.df_train, 'xlsx')
+        self.filepaths.append(name)
+        DataReader.read_from_file(name, usecols=['id', 'feature1'])
+
+    @raises(ValueError)
+    def test_read_from_file_jsonlines_with_usecols(self):
+        name = TestDataReader.make_file_from_ext(self.df_train, 'jsonlines')
+        self.filepaths.append(name)
+        DataReader.read_from_file(name, usecols=['id', 'feature1'])
+
+    @raises(ValueError)
+    def test_read_from_file_jsonlines_with_dtype(self):
+        name = TestDataReader.make_file_from_ext(self.df_train, 'jsonlines')
+        self.filepaths.append(name)
+        DataReader.read_from_file(name, dtype={'feature1': 'float64'})
+
+    def test_read_from_file_in_chunks(self):
+        name = TestDataReader.make_file_from_ext(self.df_train, 'tsv')
+        self.filepaths.append(name)
+
+        df_read = DataReader.read_from_file(name,
+                                            converters={'id': str, 'candidate': str},
+                                            chunksize=2)
+        assert_frame_equal(self.df_train, df_read)
+
+    def test_read_from_file_in_chunks_with_filter(self):
+        name = TestDataReader.make_file_from_ext(self.df_train, 'csv')
+        self.filepaths.append(name)
+
+        df_read = DataReader.read_from_file(name,
+                                            converters={'id': str, 'candidate': str},
+                                            chunksize=2,
+                                            chunk_filter=lambda df: df[df['gender'] == 'F'])
+        df_expected = self.df_train[self.df_train['gender'] == 'F'].reset_index(drop=True)
+        assert_frame_equal(df_expected, df_read)
+
     @raises(ValueError)
     def test_read_data_file_wrong_extension(self):
         self.check_read_from_file('txt')
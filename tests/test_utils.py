@@ -76,6 +76,31 @@ def test_parse_json_with_comments():
     eq_(result, {'key1': 'value1', 'key2': 'value2', 'key3': 5})
 
 
+def test_parse_json_with_comments_modified_file():
+
+    tempf = tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False)
+    filename = tempf.name
+    tempf.close()
+
+    with open(filename, 'w') as buff:
+        buff.write('{"key1": "value1"} // comment')
+
+    # modifying the returned object should not affect later calls
+    result = parse_json_with_comments(filename)
+    result['key1'] = 'modified'
+    eq_(parse_json_with_comments(filename), {'key1': 'value1'})
+
+    # changing the file should give us the new contents
+    # even if the file size and modification time are the same
+    with open(filename, 'w') as buff:
+        buff.write('{"key1": "value2"} // comment')
+
+    result = parse_json_with_comments(filename)
+    unlink(filename)
+
+    eq_(result, {'key1': 'value2'})
+
+
 def test_float_format_func_default_prec():
     x = 1 / 3
     ans = '0.333'